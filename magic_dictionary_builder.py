@@ -6,24 +6,130 @@ Generates custom wordlists from GAU and URLFinder results
 
 import subprocess
 import argparse
+import re
 import sys
-from urllib.parse import urlparse
 import os
+import tempfile
+import shutil
+import threading
+import signal
+import multiprocessing
+import heapq
+from collections import deque
+from itertools import islice
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+def _extract_path(url):
+    """Return the path of an http(s) URL as bytes, cheaper than a full urlparse"""
+    start = url.find(b'://') + 3
+    end = len(url)
+    
+    query = url.find(b'?', start)
+    if query >= 0:
+        end = query
+    fragment = url.find(b'#', start, end)
+    if fragment >= 0:
+        end = fragment
+    
+    # The path starts at the first slash after the host
+    slash = url.find(b'/', start, end)
+    if slash < 0:
+        return b''
+    
+    # Like urlparse, drop ;params from the last segment (e.g. ;jsessionid=...)
+    params = url.find(b';', url.rfind(b'/', slash, end), end)
+    if params >= 0:
+        end = params
+    return url[slash:end]
+
+def _batched(iterable, size):
+    """Yield lists of up to size items from iterable"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def _extract_paths_worker(urls):
+    """Process pool entry point, extract paths from one batch of URLs"""
+    return DictionaryBuilder().extract_paths(urls)
 
 class DictionaryBuilder:
-    def __init__(self, timeout=None):
-        # Extensions to filter out (not include in dictionary)
-        self.filtered_extensions = {
-            'js', 'gif', 'jpg', 'jpeg', 'png', 'css', 'ttf', 'woff', 'woff2', 
-            'svg', 'pdf', 'ico', 'webp', 'mp4', 'mp3', 'avi', 'mov', 'zip', 
-            'rar', 'tar', 'gz', 'bz2', 'exe', 'dmg', 'iso', 'doc', 'docx', 
-            'xls', 'xlsx', 'ppt', 'pptx', 'eot', 'swf'
-        }
+    # Extensions to filter out (not include in dictionary), as bytes since
+    # tool output is parsed undecoded
+    _FILTERED_EXT = frozenset((
+        b'js', b'gif', b'jpg', b'jpeg', b'png', b'css', b'ttf', b'woff', b'woff2', 
+        b'svg', b'pdf', b'ico', b'webp', b'mp4', b'mp3', b'avi', b'mov', b'zip', 
+        b'rar', b'tar', b'gz', b'bz2', b'exe', b'dmg', b'iso', b'doc', b'docx', 
+        b'xls', b'xlsx', b'ppt', b'pptx', b'eot', b'swf'
+    ))
+    
+    # Anything longer can't be a filtered extension
+    _MAX_EXT_LEN = max(map(len, _FILTERED_EXT))
+    
+    # Path segments, matched in C instead of with Python-level splits
+    _SEG_RE = re.compile(rb'[^/]+')
+    
+    # URLs sent to a worker process at a time when parsing with --workers
+    _BATCH_SIZE = 10000
+    
+    def __init__(self, timeout=None, workers=1):
         self.timeout = timeout
+        self.workers = workers
+        self.url_counts = {}
+    
+    def _stream_tool(self, name, cmd):
+        """Run a tool and yield its raw output lines while it is still running"""
+        count = 0
+        expired = threading.Event()
+        
+        def expire():
+            expired.set()
+            proc.kill()
+        
+        # stderr goes to a temp file so a chatty tool can't fill the pipe and block
+        with tempfile.TemporaryFile() as stderr_file:
+            # Output is read as bytes, only the paths that make it to the dictionary get decoded
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file,
+                                    bufsize=1024 * 1024)
+            timer = None
+            if self.timeout:
+                # Killing the tool closes its stdout, which ends the read loop below
+                timer = threading.Timer(self.timeout, expire)
+                timer.start()
+            
+            try:
+                for line in proc.stdout:
+                    url = line.strip()
+                    if url:
+                        count += 1
+                        yield url
+                proc.wait()
+            finally:
+                if timer:
+                    timer.cancel()
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stdout.close()
+                self.url_counts[name] = count
+            
+            if expired.is_set():
+                raise subprocess.TimeoutExpired(cmd, self.timeout)
+            
+            if proc.returncode == 0:
+                print(f"[+] {name} completed! Found {count} URLs")
+            else:
+                print(f"[-] {name} returned code {proc.returncode} after {count} URLs")
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode('utf-8', errors='replace').strip()
+                if stderr:
+                    print(f"[-] {name} stderr: {stderr}")
         
     def run_gau(self, domain):
-        """Execute GAU with subdomains"""
+        """Execute GAU with subdomains, yielding URLs as they are found"""
         print(f"[+] Running GAU for {domain}...")
         print(f"[*] This may take several minutes for large domains...")
         print(f"[*] Press Ctrl+C to interrupt if needed")
@@ -31,40 +137,27 @@ class DictionaryBuilder:
             cmd = ['gau', '--subs', domain]
             print(f"[*] Executing: {' '.join(cmd)}")
             
-            # Use timeout if specified, otherwise no timeout
-            kwargs = {'capture_output': True, 'text': True}
             if self.timeout:
-                kwargs['timeout'] = self.timeout
                 print(f"[*] Timeout set to {self.timeout} seconds")
             else:
                 print(f"[*] No timeout - will wait for completion")
             
-            result = subprocess.run(cmd, **kwargs)
-            
-            if result.returncode == 0:
-                urls = [url.strip() for url in result.stdout.strip().split('\n') if url.strip()]
-                print(f"[+] GAU completed! Found {len(urls)} URLs")
-                return urls
-            else:
-                print(f"[-] GAU returned code {result.returncode}")
-                if result.stderr:
-                    print(f"[-] GAU stderr: {result.stderr}")
-                return []
+            yield from self._stream_tool('GAU', cmd)
         except subprocess.TimeoutExpired:
             print(f"[-] GAU timeout after {self.timeout} seconds")
-            return []
+            return
         except KeyboardInterrupt:
             print("\n[-] GAU interrupted by user")
-            return []
+            return
         except FileNotFoundError:
             print("[-] GAU not found. Install with: go install github.com/lc/gau/v2/cmd/gau@latest")
-            return []
+            return
         except Exception as e:
             print(f"[-] Unexpected error running GAU: {e}")
-            return []
+            return
     
     def run_urlfinder(self, domain):
-        """Execute URLFinder from Project Discovery"""
+        """Execute URLFinder from Project Discovery, yielding URLs as they are found"""
         print(f"[+] Running URLFinder for {domain}...")
         print(f"[*] This may take several minutes for large domains...")
         print(f"[*] Press Ctrl+C to interrupt if needed")
@@ -73,90 +166,113 @@ class DictionaryBuilder:
             cmd = ['urlfinder', '-d', domain, '-silent']
             print(f"[*] Executing: {' '.join(cmd)}")
             
-            # Use timeout if specified, otherwise no timeout
-            kwargs = {'capture_output': True, 'text': True}
             if self.timeout:
-                kwargs['timeout'] = self.timeout
                 print(f"[*] Timeout set to {self.timeout} seconds")
             else:
                 print(f"[*] No timeout - will wait for completion")
             
-            result = subprocess.run(cmd, **kwargs)
-            
-            if result.returncode == 0:
-                urls = [url.strip() for url in result.stdout.strip().split('\n') if url.strip()]
-                print(f"[+] URLFinder completed! Found {len(urls)} URLs")
-                return urls
-            else:
-                print(f"[-] URLFinder returned code {result.returncode}")
-                if result.stderr:
-                    print(f"[-] URLFinder stderr: {result.stderr}")
-                return []
+            yield from self._stream_tool('URLFinder', cmd)
                 
         except subprocess.TimeoutExpired:
             print(f"[-] URLFinder timeout after {self.timeout} seconds")
-            return []
+            return
         except KeyboardInterrupt:
             print("\n[-] URLFinder interrupted by user")
-            return []
+            return
         except FileNotFoundError:
             print("[-] URLFinder not found. Install with: go install -v github.com/projectdiscovery/urlfinder/cmd/urlfinder@latest")
-            return []
+            return
         except Exception as e:
             print(f"[-] Unexpected error running URLFinder: {e}")
-            return []
+            return
     
-    def extract_paths(self, urls):
-        """Extract directories and files from URLs"""
+    def extract_paths(self, urls, seen=None):
+        """Extract directories and files from URLs (bytes), skipping paths already in seen"""
+        # Segments stay as raw bytes all the way to the output file, so malformed
+        # UTF-8 in archived URLs can't break parsing and nothing gets decoded
         paths = set()
+        if seen is None:
+            seen = set()
+        
+        # This loop runs once per URL, bind the hot lookups to locals instead of
+        # resolving globals and attributes on every iteration
+        extract_path = _extract_path
+        split_segments = self._SEG_RE.findall
+        add_seen = seen.add
+        add_path = paths.add
+        filtered_extensions = DictionaryBuilder._FILTERED_EXT
+        max_ext_len = DictionaryBuilder._MAX_EXT_LEN
         
         for url in urls:
-            if not url or not url.startswith(('http://', 'https://')):
+            # Plain slice compares skip startswith's tuple walk, https is
+            # checked first since it is the most common scheme in tool output
+            if url[:8] != b'https://' and url[:7] != b'http://':
                 continue
                 
             try:
-                parsed = urlparse(url)
-                path = parsed.path
+                path = extract_path(url)
                 
-                if not path or path == '/':
+                if not path or path == b'/':
                     continue
                 
-                # Split path into parts
-                path_parts = [part for part in path.split('/') if part]
+                # Archived URLs often repeat a path with different query strings,
+                # a path already seen can't add new segments so skip the split and
+                # set inserts. Only the path fingerprint is kept, not the full string
+                fingerprint = hash(path)
+                if fingerprint in seen:
+                    continue
+                add_seen(fingerprint)
                 
-                for part in path_parts:
-                    if not part:
-                        continue
+                # Split path into parts
+                for part in split_segments(path):
+                    # If it's a file, check extension. A leading dot is a hidden
+                    # file name (.htaccess), and long extensions skip the slice and lookup
+                    dot = part.rfind(b'.')
+                    if dot > 0 and len(part) - dot - 1 <= max_ext_len:
+                        if part[dot + 1:].lower() in filtered_extensions:
+                            continue
                     
-                    # If it's a file, check extension
-                    if '.' in part:
-                        extension = part.split('.')[-1].lower()
-                        if extension not in self.filtered_extensions:
-                            paths.add(part)
-                    else:
-                        # It's a directory
-                        paths.add(part)
-                
-                # Also add partial paths (parent directories)
-                current_path = ""
-                for part in path_parts[:-1]:  # Exclude last part if it's a file
-                    if part:
-                        paths.add(part)
+                    # Files with other extensions and directories
+                    add_path(part)
                         
             except Exception as e:
-                print(f"[-] Error parsing URL {url}: {e}")
+                print(f"[-] Error parsing URL {url.decode('utf-8', errors='replace')}: {e}")
                 continue
         
         return paths
     
+    def extract_paths_pooled(self, urls, pool):
+        """Extract directories and files from URLs in batches spread over a process pool"""
+        paths = set()
+        pending = deque()
+        
+        for batch in _batched(urls, self._BATCH_SIZE):
+            pending.append(pool.apply_async(_extract_paths_worker, (batch,)))
+            # Merge finished batches as we go so their results don't pile up
+            while pending and pending[0].ready():
+                paths |= pending.popleft().get()
+        
+        for result in pending:
+            paths |= result.get()
+        return paths
+    
     def save_dictionary(self, words, output_file):
-        """Save the dictionary sorted and unique"""
+        """Save the dictionary (bytes words) sorted and unique"""
         try:
-            unique_words = sorted(set(words))
+            unique_words = set(words)
+            
+            # Bucket by first byte and sort each bucket on its own, the
+            # output is the same as a full sort
+            buckets = [[] for _ in range(256)]
+            for word in unique_words:
+                buckets[word[0] if word else 0].append(word)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                for word in unique_words:
-                    f.write(f"{word}\n")
+            # One write per bucket instead of a write per word
+            with open(output_file, 'wb') as f:
+                for bucket in buckets:
+                    if bucket:
+                        bucket.sort()
+                        f.write(b'\n'.join(bucket) + b'\n')
             
             print(f"[+] Dictionary saved to {output_file}")
             print(f"[+] Total unique words: {len(unique_words)}")
@@ -176,35 +292,65 @@ class DictionaryBuilder:
         else:
             print(f"[*] No timeout - tools will run until completion")
         
-        gau_urls = []
-        urlfinder_urls = []
+        self.url_counts = {'GAU': 0, 'URLFinder': 0}
+        seen_paths = set()
+        gau_paths = set()
+        urlfinder_paths = set()
         
-        # Run tools
-        if not skip_gau:
-            print(f"\n[*] Step 1: Running GAU...")
-            gau_urls = self.run_gau(domain)
-        else:
-            print(f"\n[*] Step 1: Skipping GAU")
+        # Run tools in parallel, they are independent network-bound jobs.
+        # Each worker parses URLs as they are streamed so the full output is never held in memory,
+        # and both share seen_paths so a path reported by both tools is only split once.
+        # With --workers the parsing is handed to a process pool in batches instead
+        pool = None
+        if self.workers > 1:
+            print(f"[*] Parsing URLs with {self.workers} worker processes")
+            # Workers ignore Ctrl+C so an interrupt only stops the tools
+            pool = multiprocessing.Pool(self.workers, initializer=signal.signal,
+                                        initargs=(signal.SIGINT, signal.SIG_IGN))
         
-        if not skip_urlfinder:
-            step_num = 2 if not skip_gau else 1
-            print(f"\n[*] Step {step_num}: Running URLFinder...")
-            urlfinder_urls = self.run_urlfinder(domain)
+        if skip_gau:
+            print(f"\n[*] Step 1: Skipping GAU, running URLFinder...")
+        elif skip_urlfinder:
+            print(f"\n[*] Step 1: Running GAU, skipping URLFinder...")
         else:
-            print(f"\n[*] Step 2: Skipping URLFinder")
+            print(f"\n[*] Step 1: Running GAU and URLFinder in parallel...")
         
-        final_step = 3 if not skip_gau and not skip_urlfinder else 2
-        print(f"\n[*] Step {final_step}: Processing results...")
+        def extract(urls):
+            if pool:
+                return self.extract_paths_pooled(urls, pool)
+            return self.extract_paths(urls, seen_paths)
         
-        # Show individual results
-        print(f"[*] GAU results: {len(gau_urls)} URLs")
-        print(f"[*] URLFinder results: {len(urlfinder_urls)} URLs")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            gau_future = None
+            urlfinder_future = None
+            if not skip_gau:
+                gau_future = executor.submit(extract, self.run_gau(domain))
+            if not skip_urlfinder:
+                urlfinder_future = executor.submit(extract, self.run_urlfinder(domain))
+            
+            try:
+                if gau_future:
+                    gau_paths = gau_future.result()
+                if urlfinder_future:
+                    urlfinder_paths = urlfinder_future.result()
+            except KeyboardInterrupt:
+                # The tools share our process group and got the signal too,
+                # whatever they printed so far is kept as partial results
+                print("\n[-] Interrupted by user, waiting for tools to stop...")
+                gau_paths = gau_future.result() if gau_future else set()
+                urlfinder_paths = urlfinder_future.result() if urlfinder_future else set()
         
-        # Combine results
-        all_urls = list(set(gau_urls + urlfinder_urls))
-        print(f"[+] Total unique URLs found: {len(all_urls)}")
+        if pool:
+            pool.close()
+            pool.join()
+        
+        print(f"\n[*] Step 2: Processing results...")
+        
+        # Show individual results
+        print(f"[*] GAU results: {self.url_counts['GAU']} URLs")
+        print(f"[*] URLFinder results: {self.url_counts['URLFinder']} URLs")
         
-        if not all_urls:
+        if not sum(self.url_counts.values()):
             print("[-] No URLs found.")
             print("[*] Possible causes:")
             print("    - Domain might be new or have limited web presence")
@@ -214,16 +360,13 @@ class DictionaryBuilder:
             print("    - Try increasing timeout with -t flag")
             return False
         
-        # Show sample URLs for debugging
-        if all_urls and len(all_urls) > 0:
-            print(f"[*] Sample URLs found:")
-            for i, url in enumerate(all_urls[:5]):
-                print(f"    {url}")
-            if len(all_urls) > 5:
-                print(f"    ... and {len(all_urls) - 5} more")
+        if seen_paths:
+            print(f"[+] Total unique URL paths found: {len(seen_paths)}")
         
-        # Extract paths
-        paths = self.extract_paths(all_urls)
+        # Combine results
+        # Merge the smaller set into the larger one instead of copying both
+        paths, other_paths = sorted((gau_paths, urlfinder_paths), key=len, reverse=True)
+        paths |= other_paths
         print(f"[+] Paths extracted: {len(paths)}")
         
         if not paths:
@@ -231,7 +374,8 @@ class DictionaryBuilder:
             return False
         
         # Show sample paths
-        sample_paths = sorted(list(paths))[:10]
+        # Only the first few are needed, save_dictionary does the full sort
+        sample_paths = [path.decode('utf-8', errors='replace') for path in heapq.nsmallest(10, paths)]
         print(f"[*] Sample paths: {', '.join(sample_paths[:5])}")
         if len(sample_paths) > 5:
             print(f"    ... and {len(paths) - 5} more")
@@ -251,6 +395,7 @@ Examples:
   python3 dictionary_builder.py -i target.com -o gau_only.txt --no-urlfinder
   python3 dictionary_builder.py -i target.com -o url_only.txt --no-gau
   python3 dictionary_builder.py --test-tools
+  python3 dictionary_builder.py --test-tools --deep
 
 Requirements:
   - gau: go install github.com/lc/gau/v2/cmd/gau@latest
@@ -264,18 +409,22 @@ Requirements:
                        help='Output file for the dictionary')
     parser.add_argument('--test-tools', action='store_true',
                        help='Test if GAU and URLFinder are properly installed')
+    parser.add_argument('--deep', action='store_true',
+                       help='With --test-tools, also run each tool to check it works')
     parser.add_argument('-t', '--timeout', type=int,
                        help='Timeout in seconds for each tool (default: no timeout)')
     parser.add_argument('--no-gau', action='store_true',
                        help='Skip GAU and only use URLFinder')
     parser.add_argument('--no-urlfinder', action='store_true',
                        help='Skip URLFinder and only use GAU')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                       help='Processes used to parse URLs (default: 1, parse while reading tool output)')
     
     args = parser.parse_args()
     
     # Test tools if requested
     if args.test_tools:
-        test_tools()
+        test_tools(deep=args.deep)
         return
     
     # Validate required arguments
@@ -289,12 +438,15 @@ Requirements:
         sys.exit(1)
     
     # Create instance and build dictionary
-    builder = DictionaryBuilder(timeout=args.timeout)
+    builder = DictionaryBuilder(timeout=args.timeout, workers=args.workers)
     
     # Override tool selection if specified
     if args.no_gau and args.no_urlfinder:
         parser.error("Cannot skip both GAU and URLFinder")
     
+    if args.workers < 1:
+        parser.error("-w/--workers must be at least 1")
+    
     success = builder.build_dictionary(domain, args.output, 
                                      skip_gau=args.no_gau, 
                                      skip_urlfinder=args.no_urlfinder)
@@ -306,28 +458,37 @@ Requirements:
         print(f"\n[-] Error creating dictionary")
         sys.exit(1)
 
-def test_tools():
-    """Test if required tools are installed and working"""
+def test_tools(deep=False):
+    """Test if required tools are installed, and with deep=True that they run"""
     print("[+] Testing required tools...")
     
     tools = [
-        ('gau', ['gau', '--help']),
-        ('urlfinder', ['urlfinder', '-h'])
+        ('gau', '--help'),
+        ('urlfinder', '-h')
     ]
     
     all_working = True
     
-    for tool_name, cmd in tools:
+    for tool_name, help_flag in tools:
+        # A PATH lookup is enough to know the tool is installed, no process spawn needed
+        path = shutil.which(tool_name)
+        if not path:
+            print(f"[-] {tool_name}: Not found")
+            all_working = False
+            continue
+        
+        if not deep:
+            print(f"[+] {tool_name}: OK ({path})")
+            continue
+        
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            result = subprocess.run([path, help_flag], stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL, timeout=10)
             if result.returncode == 0:
-                print(f"[+] {tool_name}: OK")
+                print(f"[+] {tool_name}: OK ({path})")
             else:
                 print(f"[-] {tool_name}: Error (return code {result.returncode})")
                 all_working = False
-        except FileNotFoundError:
-            print(f"[-] {tool_name}: Not found")
-            all_working = False
         except subprocess.TimeoutExpired:
             print(f"[-] {tool_name}: Timeout")
             all_working = False